@@ -0,0 +1,24 @@
+# cython: language_level=3
+"""
+Compiled DFA walk for RegexFSM, an ahead-of-time alternative to the numba kernel.
+
+Build in place with: cythonize -i _regex_kernel.pyx
+"""
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef bint walk(
+    const int[:, ::1] table, const unsigned char[::1] data, const unsigned char[::1] accept
+) noexcept nogil:
+    """
+    Walks the transition table over an encoded input. The reject state is
+    absorbing, so the loop needs no early exit.
+    """
+    cdef Py_ssize_t i
+    cdef int state = 1
+
+    for i in range(data.shape[0]):
+        state = table[state, data[i]]
+    return accept[state] != 0
@@ -3,15 +3,116 @@ FSM for regex matching.
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from array import array
+from functools import lru_cache
+from itertools import chain
+from typing import Callable
+
+try:
+    import numpy as np
+    from numba import njit, prange
+except ImportError:  # numba is optional, the table is walked in pure Python without it
+    np = None
+    njit = None
+
+try:
+    from _regex_kernel import walk as walk_table_c
+except ImportError:  # optional too, built with `cythonize -i _regex_kernel.pyx`
+    walk_table_c = None
+
+# state kinds, checked instead of the state class while compiling
+K_ASCII, K_STAR, K_PLUS, K_DOT, K_TERM, K_START = range(6)
+# kinds of states that consume no characters
+EPSILON_KINDS = (K_START, K_STAR, K_PLUS)
+
+# transition table columns: one per ASCII code and one shared by all other characters
+NON_ASCII = 128
+ALPHABET_SIZE = NON_ASCII + 1
+
+
+def encode_input(input_str: str) -> bytes:
+    """
+    Converts a string to transition table columns, one byte per character.
+    """
+    if input_str.isascii():
+        return input_str.encode("ascii")
+    return bytes(min(ord(char), NON_ASCII) for char in input_str)
+
+
+def char_bit(char: str) -> int:
+    """
+    Bit of the character's transition table column in a state's character mask.
+    """
+    return 1 << min(ord(char), NON_ASCII)
+
+
+# character mask with every column set
+ANY_CHAR_MASK = (1 << ALPHABET_SIZE) - 1
+
+
+# DFA state ids: the absorbing reject state and the initial state
+REJECT, START = 0, 1
+
+# patterns needing more DFA states are matched by stepping the NFA masks instead,
+# since subset construction can produce exponentially many states (e.g. ".*a.....")
+MAX_DFA_STATES = 4096
+
+# DFAs with at most this many states get a generated matcher with hardcoded transitions,
+# used for inputs shorter than JIT_MIN_LENGTH (it is slower than the table on long
+# inputs that keep switching between states)
+CODEGEN_MAX_STATES = 16
+
+# shorter inputs are faster to walk in Python than to pass to the compiled kernel
+JIT_MIN_LENGTH = 32
+
+if njit is not None:
+    @njit(cache=True)
+    def walk_table(table, data, accept):
+        """
+        Compiled DFA walk over an encoded input.
+        """
+        state = START
+        for i in range(data.size):
+            state = table[state, data[i]]
+        return accept[state]
+
+    @njit(cache=True, parallel=True)
+    def walk_table_batch(table, accept, data, offsets, out):
+        """
+        Compiled DFA walk over many encoded inputs packed into one buffer,
+        input i being data[offsets[i]:offsets[i + 1]].
+        """
+        for i in prange(out.size):
+            state = START
+            for k in range(offsets[i], offsets[i + 1]):
+                state = table[state, data[k]]
+            out[i] = accept[state]
+
+    # compile on import rather than on the first long input; numba compiles read-only
+    # arrays separately, so the tables and input are read-only as in RegexFSM
+    _warm_table = np.zeros((2, ALPHABET_SIZE), np.int32)
+    _warm_accept = np.ones(2, np.bool_)
+    _warm_table.flags.writeable = _warm_accept.flags.writeable = False
+    walk_table(_warm_table, np.frombuffer(b"\0", np.uint8), _warm_accept)
+    walk_table_batch(
+        _warm_table, _warm_accept, np.frombuffer(b"\0", np.uint8),
+        np.array([0, 1], np.int64), np.zeros(1, np.bool_)
+    )
+    del _warm_table, _warm_accept
 
 
 class State(ABC):
     """
     Base class for defining states in a Finite State Machine (FSM).
     """
+    __slots__ = ("next_states", "kind", "char_mask")
+
     @abstractmethod
     def __init__(self) -> None:
         self.next_states = []
+        # bit i is set if the state accepts characters of transition table column i,
+        # used to build the DFA (check_self is not on the matching path)
+        self.char_mask = 0
 
     @abstractmethod
     def check_self(self, char: str) -> bool:
@@ -34,10 +135,11 @@ class StartState(State):
     """
     Represents the starting state in the FSM.
     """
-    next_states: list[State] = []
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
+        self.kind = K_START
 
     def check_self(self, char):
         """
@@ -50,8 +152,11 @@ class TerminationState(State):
     """
     Represents the termination state in the FSM.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
+        self.kind = K_TERM
 
     def check_self(self, char: str) -> bool:
         """
@@ -64,11 +169,12 @@ class DotState(State):
     """
     state for . character (any character accepted)
     """
-
-    # next_states: list[State] = []
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
+        self.kind = K_DOT
+        self.char_mask = ANY_CHAR_MASK
 
     def check_self(self, char: str):
         """
@@ -81,13 +187,15 @@ class AsciiState(State):
     """
     state for alphabet letters or numbers
     """
+    __slots__ = ("symbol",)
 
-    next_states: list[State] = []
     curr_sym = ""
 
     def __init__(self, symbol: str) -> None:
         super().__init__()
+        self.kind = K_ASCII
         self.symbol = symbol
+        self.char_mask = char_bit(symbol)
 
     def check_self(self, curr_char: str) -> bool:
         """
@@ -100,13 +208,13 @@ class StarState(State):
     """
     State for handling the '*' character, which allows repetition of a previous state.
     """
-    next_states: list[State] = []
+    __slots__ = ("checking_state",)
 
     def __init__(self, checking_state: State):
         super().__init__()
+        self.kind = K_STAR
         self.checking_state = checking_state
         self.next_states.append(checking_state)
-        self.next_states.extend(checking_state.next_states)
         checking_state.next_states.append(self)
 
     def check_self(self, char):
@@ -121,13 +229,13 @@ class PlusState(State):
     """
     State for handling the '+' character, which ensures the previous state occurs at least once.
     """
-    next_states: list[State] = []
+    __slots__ = ("checking_state",)
 
     def __init__(self, checking_state: State):
         super().__init__()
+        self.kind = K_PLUS
         self.checking_state = checking_state
         self.next_states.append(checking_state)
-        self.next_states.extend(checking_state.next_states)
         checking_state.next_states.append(self)
 
     def check_self(self, char: str) -> bool:
@@ -137,101 +245,519 @@ class PlusState(State):
         return self.checking_state.check_self(char)
 
 
+def repeat_state(state_cls: type[State], checking_state: State | None) -> State:
+    """
+    Creates a StarState or PlusState, checking that there is a state to repeat.
+    """
+    if checking_state is None:
+        raise AttributeError("Nothing to repeat")
+    return state_cls(checking_state)
+
+
+# constructors of states for special pattern characters, called with
+# the previous state and the last state that can be repeated
+STATE_DISPATCH = {
+    ".": lambda prev_state, tmp_next_state: DotState(),
+    "*": lambda prev_state, tmp_next_state: repeat_state(StarState, tmp_next_state),
+    "+": lambda prev_state, tmp_next_state: repeat_state(PlusState, tmp_next_state),
+}
+
+
 class RegexFSM:
     """
     Finite State Machine (FSM) for matching a regular expression pattern.
+
+    The pattern is first compiled into a graph of states (NFA), which is then
+    converted by subset construction into a transition table (DFA), so matching
+    costs a single table lookup per input character.
     """
-    curr_state: State = StartState()
-    term_state: TerminationState = TerminationState()
+    curr_state: State
+    term_state: TerminationState
 
-    def __init__(self, regex_expr: str) -> None:
+    def __init__(self, regex_expr: str, minimize: bool = False) -> None:
+        self.curr_state = StartState()
+        self.term_state = TerminationState()
 
-        prev_state = self.curr_state
-        tmp_next_state = self.curr_state
+        prev_state: State = self.curr_state
+        # last state that can be repeated by '*' or '+' and the state before it
+        tmp_next_state: State | None = None
+        atom_pred: State | None = None
 
         for char in regex_expr:
-            tmp_next_state = self.__init_next_state(char, prev_state, tmp_next_state)
-            if tmp_next_state:
-                prev_state.next_states.append(tmp_next_state)
-                prev_state = tmp_next_state
+            new_state = self.__init_next_state(char, prev_state, tmp_next_state)
+            if new_state.kind in (K_STAR, K_PLUS):
+                if new_state.kind == K_STAR:
+                    # '*' also allows to skip the repeated state entirely
+                    atom_pred.next_states.append(new_state)
+                tmp_next_state = None
+            else:
+                prev_state.next_states.append(new_state)
+                tmp_next_state = new_state
+                atom_pred = prev_state
+            prev_state = new_state
 
         prev_state.next_states.append(self.term_state)
 
+        self.__collapse_epsilon()
+        self.__build_arrays()
+        self.__build_dfa()
+        if minimize and self._trans is not None:
+            self.__minimize()
+        self._matcher = None
+        if self._trans is not None and len(self._trans) <= CODEGEN_MAX_STATES:
+            self._matcher = self.__generate_matcher()
+        if njit is not None and self._trans is not None:
+            self._table = np.array(self._trans, dtype=np.int32)
+            self._accept_table = np.array(self._accept, dtype=np.bool_)
+            self._table.flags.writeable = False
+            self._accept_table.flags.writeable = False
+        if walk_table_c is not None and self._trans is not None:
+            # share the numpy table if there is one, it is int32 and C-contiguous
+            if njit is not None:
+                self._table_c = memoryview(self._table)
+            else:
+                flat_table = memoryview(array("i", chain.from_iterable(self._trans)))
+                self._table_c = flat_table.cast("B").cast("i", (len(self._trans), ALPHABET_SIZE))
+            self._accept_c = bytes(self._accept)
+        self._required = self.__required_literal(regex_expr) or None
+
     def __init_next_state(
-        self, next_token: str, prev_state: State, tmp_next_state: State
-    ) -> State | None:
-        new_state = None
-
-        match next_token:
-            case next_token if next_token == ".":
-                new_state = DotState()
-            case next_token if next_token == "*":
-                new_state = StarState(tmp_next_state)
-            case next_token if next_token == "+":
-                new_state = PlusState(tmp_next_state)
-            case next_token if next_token.isascii():
-                new_state = AsciiState(next_token)
-            case _:
-                raise AttributeError("Character is not supported")
-
-        return new_state
+        self, next_token: str, prev_state: State, tmp_next_state: State | None
+    ) -> State:
+        constructor = STATE_DISPATCH.get(next_token)
+        if constructor is not None:
+            return constructor(prev_state, tmp_next_state)
+        if next_token.isascii():
+            return AsciiState(next_token)
+        raise AttributeError("Character is not supported")
+
+    @staticmethod
+    def __required_literal(regex_expr: str) -> str:
+        """
+        Returns the longest run of characters that every matching string contains:
+        consecutive AsciiStates that are not optional. A '+' state ends a run and
+        also starts the next one, since its last repetition precedes what follows.
+        """
+        longest = run = ""
 
-    def check_string(self, input_str: str) -> bool:
+        for i, char in enumerate(regex_expr):
+            if char in "*+":
+                continue
+            quantifier = regex_expr[i + 1:i + 2]
+
+            if char == "." or quantifier == "*":
+                run = ""
+                continue
+            run += char
+            longest = max(longest, run, key=len)
+            if quantifier == "+":
+                run = char
+
+        return longest
+
+    @staticmethod
+    def __closure(states: list[State]) -> frozenset[State]:
         """
-        Checks if the input string matches the regular expression pattern.
+        Follows StartState, StarState and PlusState (which consume no characters)
+        and returns the set of reachable character-consuming and termination states.
         """
-        active_states = {self.curr_state}
+        visited = set()
+        stack = list(states)
 
-        for char in input_str:
-            next_active_states = set()
+        while stack:
+            state = stack.pop()
+            if state in visited:
+                continue
+            visited.add(state)
 
-            for initial_state in active_states:
-                visited = set()
-                stack = [(initial_state, False)]
+            if state.kind in EPSILON_KINDS:
+                stack.extend(state.next_states)
 
-                while stack:
-                    current_state, el = stack.pop()
+        return frozenset(state for state in visited if state.kind not in EPSILON_KINDS)
 
-                    if current_state is None or current_state in visited and not el:
-                        continue
-                    visited.add(current_state)
+    def __collapse_epsilon(self) -> None:
+        """
+        Replaces next states of every reachable state with their closure, so
+        StarState and PlusState drop out of the graph and every character
+        is a single hop from a state to one of its next states.
+        """
+        visited = set()
+        stack: list[State] = [self.curr_state]
+
+        while stack:
+            state = stack.pop()
+            if state in visited:
+                continue
+            visited.add(state)
+            state.next_states = tuple(self.__closure(state.next_states))
+            stack.extend(state.next_states)
+
+    def __build_arrays(self) -> None:
+        """
+        Numbers character-consuming states and the termination state and stores
+        the collapsed graph as parallel arrays indexed by state id: kind, character
+        mask and next state ids in CSR layout, where the next states of state i
+        are next_flat[next_offsets[i]:next_offsets[i + 1]].
+        """
+        states: list[State] = []
+        index: dict[State, int] = {}
+        visited = set()
+        stack: list[State] = [self.curr_state]
+
+        while stack:
+            state = stack.pop()
+            if state in visited:
+                continue
+            visited.add(state)
+            if state.kind != K_START:
+                index[state] = len(states)
+                states.append(state)
+            stack.extend(state.next_states)
+
+        self._kinds = array("B", (state.kind for state in states))
+        self._char_masks = [state.char_mask for state in states]
+        self._next_offsets = array("i", [0])
+        self._next_flat = array("i")
+        for state in states:
+            self._next_flat.extend(index[next_s] for next_s in state.next_states)
+            self._next_offsets.append(len(self._next_flat))
+
+        self._start_ids = array("i", (index[state] for state in self.curr_state.next_states))
+        self._term_id = index[self.term_state]
+
+    def __build_masks(self) -> None:
+        """
+        Builds int masks from the state arrays, so that a set of NFA states
+        can be stored as an int with bit i for state i.
+        """
+        offsets = self._next_offsets
+        flat = self._next_flat
+
+        def to_mask(ids: array) -> int:
+            mask = 0
+            for i in ids:
+                mask |= 1 << i
+            return mask
+
+        self._start_mask = to_mask(self._start_ids)
+        self._next_mask = [
+            to_mask(flat[offsets[i]:offsets[i + 1]]) for i in range(len(self._kinds))
+        ]
+        self._term_bit = 1 << self._term_id
+
+        # states matching every character not in the pattern (those accepting the
+        # NON_ASCII column) and states matching some characters of the pattern
+        self._dot_mask = 0
+        self._ascii_mask: dict[int, int] = {}
+        for i, char_mask in enumerate(self._char_masks):
+            if char_mask >> NON_ASCII & 1:
+                self._dot_mask |= 1 << i
+                continue
+            while char_mask:
+                column = char_mask & -char_mask
+                code = column.bit_length() - 1
+                self._ascii_mask[code] = self._ascii_mask.get(code, 0) | 1 << i
+                char_mask ^= column
+
+        # states matching a character: its AsciiStates and every DotState
+        self._match_mask = {
+            code: mask | self._dot_mask for code, mask in self._ascii_mask.items()
+        }
+
+    def __step(self, active: int, match_mask: int) -> int:
+        """
+        Moves the active states that accept a character to their next states.
+        """
+        next_mask = self._next_mask
+        moved = active & match_mask
+        active = 0
 
-                    if isinstance(current_state, StarState):
-                        if not el:
-                            for next_s in current_state.next_states:
-                                stack.append((next_s, False))
-                            stack.append((current_state, True))
-                        else:
-                            if current_state.checking_state.check_self(char):
-                                next_active_states.add(current_state.checking_state)
+        while moved:
+            bit = moved & -moved
+            active |= next_mask[bit.bit_length() - 1]
+            moved ^= bit
+
+        return active
+
+    def __build_dfa(self) -> None:
+        """
+        Subset construction: every reachable set of NFA states becomes one DFA state.
+        """
+        self.__build_masks()
+
+        # state 0 rejects: it is reached when no NFA state is left and never left again
+        state_id: dict[int, int] = {0: REJECT, self._start_mask: START}
+        nfa_sets = [0, self._start_mask]
+
+        self._trans: list[tuple[int, ...]] = []
+        self._accept: list[bool] = []
 
-                    elif isinstance(current_state, PlusState):
-                        if current_state.checking_state.check_self(char):
-                            next_active_states.add(current_state.checking_state)
-                        for next_s in current_state.next_states:
-                            stack.append((next_s, False))
+        def intern(nfa_set: int) -> int:
+            if nfa_set not in state_id:
+                state_id[nfa_set] = len(nfa_sets)
+                nfa_sets.append(nfa_set)
+            return state_id[nfa_set]
 
-                    elif current_state.check_self(char):
-                        for next_s in current_state.next_states:
-                            next_active_states.add(next_s)
-                            stack.append((next_s, False))
+        # nfa_sets grows while new DFA states are discovered
+        for active in nfa_sets:
+            if len(nfa_sets) > MAX_DFA_STATES:
+                self._trans = self._accept = None
+                return
 
+            # every column takes the DotState transition unless the character is in the pattern
+            row = [intern(self.__step(active, self._dot_mask))] * ALPHABET_SIZE
+            for code, mask in self._ascii_mask.items():
+                if active & mask:
+                    row[code] = intern(self.__step(active, self._match_mask[code]))
+
+            self._trans.append(tuple(row))
+            self._accept.append(bool(active & self._term_bit))
+
+    def __minimize(self) -> None:
+        """
+        Hopcroft's algorithm: splits DFA states into blocks of states accepting
+        the same strings and replaces every block with a single state.
+        """
+        trans = self._trans
+        # columns of characters missing from the pattern are all equal to NON_ASCII
+        codes = [*self._ascii_mask, NON_ASCII]
+
+        inverse: list[dict[int, list[int]]] = [{} for _ in range(ALPHABET_SIZE)]
+        for state, row in enumerate(trans):
+            for code in codes:
+                inverse[code].setdefault(row[code], []).append(state)
+
+        accepting = {state for state, accept in enumerate(self._accept) if accept}
+        blocks = [set(range(len(trans))) - accepting, accepting]
+        block_of = [int(accept) for accept in self._accept]
+        work = [0, 1]
+        in_work = {0, 1}
+
+        while work:
+            splitter_id = work.pop()
+            in_work.discard(splitter_id)
+            splitter = list(blocks[splitter_id])
+
+            for code in codes:
+                # states of every block that move into the splitter on this character;
+                # each state has one target per character, so none is listed twice
+                touched: dict[int, list[int]] = {}
+                for target in splitter:
+                    for state in inverse[code].get(target, ()):
+                        touched.setdefault(block_of[state], []).append(state)
+
+                for block_id, moved in touched.items():
+                    block = blocks[block_id]
+                    if len(moved) == len(block):
+                        continue
+                    block.difference_update(moved)
+                    new_id = len(blocks)
+                    blocks.append(set(moved))
+                    for state in moved:
+                        block_of[state] = new_id
+
+                    if block_id in in_work:
+                        work.append(new_id)
+                        in_work.add(new_id)
                     else:
-                        for next_s in current_state.next_states:
-                            stack.append((next_s, False))
+                        smaller = block_id if len(block) < len(moved) else new_id
+                        work.append(smaller)
+                        in_work.add(smaller)
+
+        # renumber blocks keeping REJECT and START ids in place
+        order = [block_of[REJECT], block_of[START]]
+        order += [
+            block_id for block_id, block in enumerate(blocks)
+            if block and block_id not in order
+        ]
+        new_state = {block_id: i for i, block_id in enumerate(order)}
+        representatives = [next(iter(blocks[block_id])) for block_id in order]
+
+        self._trans = [
+            tuple(new_state[block_of[target]] for target in trans[state])
+            for state in representatives
+        ]
+        self._accept = [self._accept[state] for state in representatives]
+
+    def __generate_matcher(self) -> Callable[[str], bool]:
+        """
+        Generates and compiles a function matching strings with the DFA transitions
+        written out as code. Every state gets its own loop over a shared iterator,
+        so characters that keep the state cost a single comparison, and moving to
+        a later state falls through to its block without going back to the top.
+        For 'ab+':
+
+            def match(input_str):
+                chars = iter(input_str)
+                state = 1
+                while True:
+                    if state == 1:
+                        for char in chars:
+                            if char == 'a':
+                                state = 2
+                                break
+                            return False
+                        else:
+                            return False
+                    if state == 2:
+                        ...
+        """
+        lines = [
+            "def match(input_str):",
+            "    chars = iter(input_str)",
+            f"    state = {START}",
+            "    while True:",
+        ]
+
+        for state, row in enumerate(self._trans):
+            if state == REJECT:
+                continue
+            lines.append(f"        if state == {state}:")
+            lines.append("            for char in chars:")
+
+            # characters missing from the pattern take the non-ASCII column
+            default = row[NON_ASCII]
+            chars: dict[int, list[str]] = {}
+            for code in self._ascii_mask:
+                if row[code] != default:
+                    chars.setdefault(row[code], []).append(chr(code))
+
+            # staying in the state is the most frequent case, so it is checked first
+            if state in chars:
+                lines.append(f"                if {self.__generated_test(chars.pop(state))}:")
+                lines.append("                    continue")
+            for target, target_chars in chars.items():
+                lines.append(f"                if {self.__generated_test(target_chars)}:")
+                lines.extend(self.__generated_move(target, " " * 20))
+            if default != state:
+                lines.extend(self.__generated_move(default, " " * 16))
+            if lines[-1] == "            for char in chars:":
+                lines.append("                pass")
+
+            lines.append("            else:")
+            lines.append(f"                return {self._accept[state]}")
+
+        namespace: dict[str, Callable[[str], bool]] = {}
+        exec("\n".join(lines), namespace)
+        return namespace["match"]
+
+    @staticmethod
+    def __generated_test(chars: list[str]) -> str:
+        """
+        Source of a generated matcher condition checking for one of the characters.
+        """
+        if len(chars) == 1:
+            return f"char == {chars[0]!r}"
+        return f"char in {''.join(chars)!r}"
 
-            active_states = next_active_states
-            if not active_states:
+    @staticmethod
+    def __generated_move(target: int, indent: str) -> list[str]:
+        """
+        Source lines of a generated matcher moving to the target DFA state.
+        """
+        if target == REJECT:
+            return [f"{indent}return False"]
+        return [f"{indent}state = {target}", f"{indent}break"]
+
+    def check_string(self, input_str: str) -> bool:
+        """
+        Checks if the input string matches the regular expression pattern.
+        """
+        # the whole string has to match, so it must contain the required literal
+        if self._required is not None and self._required not in input_str:
+            return False
+
+        if self._matcher is not None and len(input_str) < JIT_MIN_LENGTH:
+            return self._matcher(input_str)
+
+        data = encode_input(input_str)
+        if self._trans is None:
+            return self.__check_lazy(data)
+        if walk_table_c is not None and len(data) >= JIT_MIN_LENGTH:
+            return walk_table_c(self._table_c, data, self._accept_c)
+        if njit is not None and len(data) >= JIT_MIN_LENGTH:
+            return bool(walk_table(
+                self._table, np.frombuffer(data, np.uint8), self._accept_table
+            ))
+
+        state = START
+        trans = self._trans
+
+        for code in data:
+            state = trans[state][code]
+            if state == REJECT:
                 return False
 
-        return any(isinstance(state, TerminationState) for state in active_states)
+        return self._accept[state]
+
+    def __check_lazy(self, data: bytes) -> bool:
+        """
+        Matches by stepping NFA masks for patterns without a DFA table. Steps are
+        memoized by (active states, character), so every distinct state set is
+        expanded once per call, like a DFA state built on demand.
+        """
+        steps: dict[tuple[int, int], int] = {}
+        match_mask = self._match_mask
+        dot_mask = self._dot_mask
+        active = self._start_mask
+
+        for code in data:
+            char_mask = match_mask.get(code, dot_mask)
+            # a single active state is cheaper to step than to look up
+            if not active & (active - 1):
+                active = self.__step(active, char_mask)
+            else:
+                key = (active, code)
+                next_active = steps.get(key)
+                if next_active is None:
+                    next_active = steps[key] = self.__step(active, char_mask)
+                active = next_active
+            if not active:
+                return False
 
+        return bool(active & self._term_bit)
+
+    def check_strings(self, input_strs: list[str]) -> np.ndarray | list[bool]:
+        """
+        Checks many input strings at once. With numba a numpy array of bools is
+        returned for every pattern, and the strings are matched in parallel when
+        the pattern has a DFA table. Without numba a list of bools is returned.
+        """
+        if njit is None:
+            return [self.check_string(input_str) for input_str in input_strs]
+        if self._trans is None:
+            return np.fromiter(
+                (self.check_string(input_str) for input_str in input_strs),
+                np.bool_, len(input_strs)
+            )
+
+        encoded = [encode_input(input_str) for input_str in input_strs]
+        offsets = np.zeros(len(encoded) + 1, np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        out = np.empty(len(encoded), np.bool_)
+
+        walk_table_batch(
+            self._table, self._accept_table,
+            np.frombuffer(b"".join(encoded), np.uint8), offsets, out
+        )
+        return out
+
+
+
+@lru_cache(maxsize=256)
+def compile_regex(pattern: str, minimize: bool = False) -> RegexFSM:
+    """
+    Returns a compiled FSM for the pattern, reusing it for repeated patterns.
+    Preferred over creating RegexFSM directly: the FSM is not changed after
+    construction, so one instance can be shared by all callers.
+    """
+    return RegexFSM(pattern, minimize)
 
 
 if __name__ == "__main__":
     RGPATTERN = "a*4.+hi"
 
-    regex_compiled = RegexFSM(RGPATTERN)
+    regex_compiled = compile_regex(RGPATTERN)
 
     print(regex_compiled.check_string("aaaaaa4uhi"))  # True
     print(regex_compiled.check_string("4uhi"))  # True
@@ -0,0 +1,104 @@
+"""
+Tests for FSM regex matching.
+"""
+import random
+import re
+
+import pytest
+
+import regex
+from regex import AsciiState, RegexFSM, compile_regex
+
+
+def random_pattern(rnd: random.Random) -> str:
+    """
+    Random pattern of literals, dots and '*'/'+' repetitions.
+    """
+    return "".join(
+        rnd.choice("ab.?") + rnd.choice(["", "", "*", "+"]) for _ in range(rnd.randint(0, 6))
+    )
+
+
+def random_inputs(rnd: random.Random, length: int) -> list[str]:
+    """
+    Random inputs of up to the given length, including non-ASCII characters.
+    """
+    return [
+        "".join(rnd.choice("ab?xé") for _ in range(rnd.randint(0, length)))
+        for _ in range(20)
+    ]
+
+
+def expected(pattern: str, input_str: str) -> bool:
+    """
+    Reference result: full match with Python's re, pattern literals escaped.
+    """
+    reference = "".join(char if char in ".*+" else re.escape(char) for char in pattern)
+    return re.fullmatch(reference, input_str, re.DOTALL) is not None
+
+
+def check_against_re(seed: int, length: int, **kwargs) -> None:
+    """
+    Compares check_string and check_strings with re on random patterns and inputs.
+    """
+    rnd = random.Random(seed)
+    for _ in range(300):
+        pattern = random_pattern(rnd)
+        fsm = RegexFSM(pattern, **kwargs)
+        inputs = random_inputs(rnd, length)
+        results = [expected(pattern, input_str) for input_str in inputs]
+
+        assert [fsm.check_string(input_str) for input_str in inputs] == results, pattern
+        assert [bool(result) for result in fsm.check_strings(inputs)] == results, pattern
+
+
+def test_states_have_own_next_states():
+    first, second = AsciiState("a"), AsciiState("b")
+    first.next_states.append(second)
+
+    assert first.next_states is not second.next_states
+    assert second.next_states == []
+
+
+def test_example():
+    fsm = compile_regex("a*4.+hi")
+
+    assert fsm.check_string("aaaaaa4uhi")
+    assert fsm.check_string("4uhi")
+    assert not fsm.check_string("meow")
+
+
+def test_compile_regex_is_cached():
+    assert compile_regex("ab+") is compile_regex("ab+")
+
+
+@pytest.mark.parametrize("pattern", ["*a", "a**", "+", "é"])
+def test_unsupported_pattern(pattern):
+    with pytest.raises(AttributeError):
+        RegexFSM(pattern)
+
+
+def test_short_inputs():
+    # short inputs of small DFAs use the generated matcher
+    check_against_re(seed=1, length=9)
+
+
+def test_long_inputs():
+    # long inputs walk the table (or a compiled kernel)
+    check_against_re(seed=2, length=4 * regex.JIT_MIN_LENGTH)
+
+
+def test_minimize():
+    check_against_re(seed=3, length=2 * regex.JIT_MIN_LENGTH, minimize=True)
+    assert len(RegexFSM("a*b*.*", minimize=True)._trans) < len(RegexFSM("a*b*.*")._trans)
+
+
+def test_lazy_fallback(monkeypatch):
+    fsm = RegexFSM(".*a" + "." * 12)
+    assert fsm._trans is None
+    assert fsm.check_string("b" * 20 + "a" + "b" * 12)
+    assert not fsm.check_string("b" * 20 + "a" + "b" * 11)
+
+    # force every pattern with more than one state set onto lazy stepping
+    monkeypatch.setattr(regex, "MAX_DFA_STATES", 1)
+    check_against_re(seed=4, length=2 * regex.JIT_MIN_LENGTH)